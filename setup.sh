@@ -24,6 +24,8 @@ pip install \
   playwright \
   httpx \
   tqdm  \
+  isal \
+  deflate \
   pytest
 
 echo "▶ Installing Playwright browser (Chromium)"
@@ -1,9 +1,11 @@
 # src/get_symbols.py
 
 import asyncio
-import zipfile
+import contextlib
+import sys
 from pathlib import Path
 from typing import List, Literal, Set
+from urllib.parse import urlsplit
 
 import pytest
 from playwright.async_api import Locator, Page
@@ -11,9 +13,9 @@ from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import async_playwright, expect
 from tqdm import tqdm
 
-from utils import gunzip_file, split_date_range
+from utils import split_date_range, unpack_download
 
-from .reporters import DownloadTqdm
+from .reporters import CdpDownloadProgress, DownloadTqdm
 
 
 class BybitHistoryClient:
@@ -21,21 +23,71 @@ class BybitHistoryClient:
     Base class for BybitHistoryClient
     """
 
-    def __init__(self, headless: bool = True, browser_name: str = "firefox"):
+    # index of the Spot/Contract button to click among the matching texts on the page
+    # NOTE: Spot and Contract OrderBook share the same index
+    _NTH_TABLE = {
+        ("Contract", "Trades"): 1,
+        ("Spot", "Trades"): 3,
+        ("Contract", "L2Book"): 4,
+        ("Spot", "L2Book"): 4,
+    }
+
+    # requests aborted when block_resources is on: nothing we click depends on them
+    _BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+    _BLOCKED_HOSTS = (
+        "google-analytics.com",
+        "googletagmanager.com",
+        "doubleclick.net",
+        "facebook.net",
+        "hotjar.com",
+    )
+
+    # text of the result row a "Detail" element belongs to (file name, dates)
+    _ROW_TEXT_JS = (
+        "(el) => (el.closest('tr, li, .ant-list-item') || el.parentElement || el)"
+        ".innerText"
+    )
+
+    def __init__(
+        self,
+        headless: bool = True,
+        browser_name: str = "firefox",
+        n_workers: int = 4,
+        block_resources: bool = True,
+    ):
+        if n_workers <= 0:
+            raise ValueError("n_workers must be a positive integer")
         self.BASE_HISTORY_URL = "https://www.bybit.com/derivatives/en/history-data"
         self.headless = headless
         self.browser_name = browser_name
+        self.n_workers = n_workers
+        self.block_resources = block_resources
         self._pw = None
         self._browser = None
         self._context = None
         self.page: Page | None = None
+        # pool of idle pages; more are opened lazily up to n_workers
+        self._free_pages: asyncio.Queue[Page] | None = None
+        self._sem: asyncio.Semaphore | None = None
+        # (margin, data_type, symbol) each page is currently set up for
+        self._configured: dict[Page, tuple[str, str, str]] = {}
+        # per-page CDP download progress relay (None when not on Chromium)
+        self._download_events: dict[Page, CdpDownloadProgress | None] = {}
 
     async def __aenter__(self):
         self._pw = await async_playwright().start()
         browser_type = getattr(self._pw, self.browser_name)
         self._browser = await browser_type.launch(headless=self.headless)
-        self._context = await self._browser.new_context(accept_downloads=True)
+        self._context = await self._browser.new_context(
+            accept_downloads=True,
+            viewport={"width": 1280, "height": 800},
+        )
+        if self.block_resources:
+            await self._context.route("**/*", self._route_filter)
         self.page = await self._context.new_page()
+        self._free_pages = asyncio.Queue()
+        self._free_pages.put_nowait(self.page)
+        self._sem = asyncio.Semaphore(self.n_workers)
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
@@ -47,16 +99,54 @@ class BybitHistoryClient:
         if self._pw:
             await self._pw.stop()
 
+    @classmethod
+    async def _route_filter(cls, route):
+        request = route.request
+        host = urlsplit(request.url).hostname or ""
+        if request.resource_type in cls._BLOCKED_RESOURCE_TYPES or any(
+            host == h or host.endswith("." + h) for h in cls._BLOCKED_HOSTS
+        ):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    @contextlib.asynccontextmanager
+    async def _borrow_page(self):
+        """Borrow an idle page from the pool, opening a new one if none is free"""
+        if self._context is None or self._free_pages is None or self._sem is None:
+            raise RuntimeError(
+                "Client not started. Use: async with BybitHistoryClient(...) as c:"
+            )
+        async with self._sem:
+            if self._free_pages.empty():
+                page = await self._context.new_page()
+            else:
+                page = self._free_pages.get_nowait()
+            try:
+                yield page
+            finally:
+                self._free_pages.put_nowait(page)
+
     async def show_spot_symbols(self):
         """Display available SPOT symbols"""
-        symbols = await self._get_symbols("Spot")
+        symbols = await self._get_symbols_on_pool_page("Spot")
         self._print_symbols("SPOT", symbols)
 
     async def show_contract_symbols(self):
         """Display available CONTRACT symbols"""
-        symbols = await self._get_symbols("Contract")
+        symbols = await self._get_symbols_on_pool_page("Contract")
         self._print_symbols("CONTRACT", symbols)
 
+    async def show_all_symbols(self):
+        """Display available SPOT and CONTRACT symbols, fetched concurrently"""
+        spot_task = asyncio.create_task(self._get_symbols_on_pool_page("Spot"))
+        contract_task = asyncio.create_task(
+            self._get_symbols_on_pool_page("Contract")
+        )
+        spot, contract = await asyncio.gather(spot_task, contract_task)
+        self._print_symbols("SPOT", spot)
+        self._print_symbols("CONTRACT", contract)
+
     async def download_data(
         self,
         margin: Literal["Spot", "Contract"],
@@ -70,80 +160,151 @@ class BybitHistoryClient:
     ):
         """
         Split [start_date, end_date] into chunks of chunk_days and call _download_data for each chunk.
+        Chunks run concurrently on up to n_workers pages; the first failing chunk
+        cancels the rest. Unzipping/gunzipping runs in background threads and is
+        awaited before returning (or re-raising).
+        A single failure is raised as is (e.g. RuntimeError, PlaywrightTimeoutError);
+        only when several chunks or unpacks fail together is an ExceptionGroup raised.
         Shows a tqdm progress bar over chunks.
         """
         ranges = split_date_range(start_date, end_date, chunk_days)
+        unpack_tasks: list[asyncio.Task[list[Path]]] = []
 
-        for s, e in tqdm(
-            ranges,
+        with tqdm(
+            total=len(ranges),
             desc=f"{margin}-{data_type}-{symbol}",
             unit="chunk",
             dynamic_ncols=True,
-        ):
-            await self._download_data_helper(
-                margin=margin,
-                data_type=data_type,
-                symbol=symbol,
-                start_date=s,
-                end_date=e,
-                final_path=final_path,
-            )
+        ) as bar:
+
+            async def _run_chunk(s: str, e: str):
+                async with self._borrow_page() as page:
+                    await self._download_data_helper(
+                        page=page,
+                        margin=margin,
+                        data_type=data_type,
+                        symbol=symbol,
+                        start_date=s,
+                        end_date=e,
+                        final_path=final_path,
+                        unpack_tasks=unpack_tasks,
+                    )
+                bar.update(1)
+
+            try:
+                # the first failing chunk cancels the others, and all of them have
+                # stopped before the browser context can be closed
+                async with asyncio.TaskGroup() as tg:
+                    for s, e in ranges:
+                        tg.create_task(_run_chunk(s, e))
+            except BaseExceptionGroup as eg:
+                # callers get the chunk's own exception, as before the TaskGroup
+                if len(eg.exceptions) == 1:
+                    raise eg.exceptions[0] from None
+                raise
+            finally:
+                # let files that were already downloaded finish unpacking
+                if unpack_tasks:
+                    await asyncio.wait(unpack_tasks)
+                unpack_errors = [
+                    exc
+                    for t in unpack_tasks
+                    if not t.cancelled() and (exc := t.exception()) is not None
+                ]
+
+        if len(unpack_errors) == 1:
+            raise unpack_errors[0]
+        if unpack_errors:
+            raise ExceptionGroup("unpacking downloaded files failed", unpack_errors)
 
     async def _download_data_helper(
         self,
+        page: Page,
         margin: Literal["Spot", "Contract"],
         data_type: Literal["Trades", "L2Book"],
         symbol: str,
         start_date: str,
         end_date: str,
         final_path: str,
+        unpack_tasks: list[asyncio.Task[list[Path]]] | None = None,
     ):
-        """Get a list of available spot contract symbols"""
-        page = await self._walk_over_site(
-            margin=margin,
-            data_type=data_type,
-            symbol=symbol,
-            start_date=start_date,
-            end_date=end_date,
-        )
-        page, message = await self._date_helper(page, start_date, end_date)
-        if message == "found symbols downloading":
-            print(f"Downloading {margin}-{data_type}-{symbol} to {final_path}")
-            await self._click_and_save_download(
+        """
+        Download a single date chunk on the given page.
+        Returns the background unpacking tasks for the downloaded files; they are
+        also appended to unpack_tasks as soon as they are started.
+        """
+        try:
+            reused = self._configured.get(page) == (margin, data_type, symbol)
+            page = await self._configure_page(
                 page=page,
-                save_dir=final_path,
-                click_locator="Download",
+                margin=margin,
+                data_type=data_type,
+                symbol=symbol,
             )
-        else:
-            print(
-                f"Data not found for {margin}-{data_type}-{symbol} date range: {
-                    start_date
-                } to {end_date}. "
+            page, message = await self._date_helper(
+                page, start_date, end_date, reused=reused
             )
-            page.close()
-
-    async def _walk_over_site(
+            if message == "stale results":
+                # could not tell the new results from the previous chunk's rows;
+                # redo this chunk on a freshly navigated page
+                self._configured.pop(page, None)
+                page = await self._configure_page(
+                    page=page,
+                    margin=margin,
+                    data_type=data_type,
+                    symbol=symbol,
+                )
+                page, message = await self._date_helper(page, start_date, end_date)
+            if message == "found symbols downloading":
+                print(f"Downloading {margin}-{data_type}-{symbol} to {final_path}")
+                return await self._click_and_save_download(
+                    page=page,
+                    save_dir=final_path,
+                    click_locator="Download",
+                    download_events=await self._get_download_events(page),
+                    unpack_tasks=unpack_tasks,
+                )
+            else:
+                print(
+                    f"Data not found for {margin}-{data_type}-{symbol} date range: {
+                        start_date
+                    } to {end_date}. "
+                )
+                return []
+        except BaseException:
+            # failed or cancelled mid-way: the page is in an unknown state,
+            # force a fresh navigation next time
+            self._configured.pop(page, None)
+            raise
+
+    async def _configure_page(
         self,
+        page: Page,
         margin: Literal["Spot", "Contract"],
         data_type: Literal["Trades", "L2Book"],
         symbol: str,
-        start_date: str,
-        end_date: str,
     ):
-        if self.page is None:
-            raise RuntimeError(
-                "Client not started. Use: async with BybitHistoryClient(...) as c:"
-            )
-        page = self.page
+        """
+        Navigate to the history page and select margin, data type, symbol and cycle.
+        Skipped if the page is already set up for the same (margin, data_type, symbol),
+        since the form keeps these selections across date-range submissions.
+        """
+        key = (margin, data_type, symbol)
+        if self._configured.get(page) == key:
+            return page
+        self._configured.pop(page, None)
+
         await page.goto(
             self.BASE_HISTORY_URL,
             timeout=100_000,
             wait_until="domcontentloaded",
         )
-        await page.wait_for_load_state("networkidle", timeout=60_000)
         hover_element = (
             "Public Trading History" if data_type == "Trades" else "OrderBook"
         )
+        await expect(page.get_by_text(hover_element, exact=True)).to_be_visible(
+            timeout=15_000
+        )
         # SPOT/CONTRACT button
         await self._hover(page, element=hover_element)
         await self._attepth_click_visible_element(
@@ -165,11 +326,40 @@ class BybitHistoryClient:
         await select_cycle.click()
         dropdown_cycle = page.locator(".ant-select-dropdown:visible")
         await dropdown_cycle.get_by_text("Everyday", exact=True).click()
+        self._configured[page] = key
         return page
 
-    async def _date_helper(self, page, start_date, end_date):
+    async def _get_download_events(self, page: Page) -> CdpDownloadProgress | None:
+        if page not in self._download_events:
+            self._download_events[page] = (
+                await CdpDownloadProgress.attach(page)
+                if self.browser_name == "chromium"
+                else None
+            )
+        return self._download_events[page]
+
+    async def _date_helper(
+        self,
+        page,
+        start_date,
+        end_date,
+        *,
+        reused: bool = False,
+        stale_timeout_ms: int = 3_000,
+    ):
         start = page.get_by_role("textbox", name="Start date")
         end = page.get_by_role("textbox", name="End date")
+        detail = page.get_by_text("Detail", exact=True)
+
+        # A reused page still shows the previous chunk's result rows; remember them
+        # (and their text, in case the table re-renders rows in place) so they are
+        # not mistaken for (or downloaded as) this chunk's results
+        stale_rows = await detail.element_handles() if reused else []
+        stale_texts = (
+            await page.evaluate(f"(rows) => rows.map({self._ROW_TEXT_JS})", stale_rows)
+            if stale_rows
+            else []
+        )
 
         await start.click()
         await start.fill(start_date)
@@ -181,10 +371,24 @@ class BybitHistoryClient:
 
         await page.get_by_text("Confirm").click()
 
+        if stale_rows:
+            try:
+                await page.wait_for_function(
+                    f"""([rows, texts]) => rows.some(
+                        (row, i) => !row.isConnected
+                            || ({self._ROW_TEXT_JS})(row) !== texts[i]
+                    )""",
+                    arg=[stale_rows, stale_texts],
+                    timeout=stale_timeout_ms,
+                )
+            except PlaywrightTimeoutError:
+                return page, "stale results"
+            finally:
+                for row in stale_rows:
+                    await row.dispose()
+
         # Wait a bit for the list to render (replace your sleep with deterministic wait)
         # We try to detect "Detail" rows appearing.
-        detail = page.get_by_text("Detail", exact=True)
-
         try:
             await detail.first.wait_for(state="visible", timeout=4000)
             return page, "found symbols downloading"
@@ -199,9 +403,10 @@ class BybitHistoryClient:
         click_locator="Download",
         prefix: str = "",
         *,
-        # how long to keep collecting extra downloads after the click
+        download_events: CdpDownloadProgress | None = None,
+        unpack_tasks: list[asyncio.Task[list[Path]]] | None = None,
+        # how long to keep collecting extra downloads after the last one arrived
         collect_window_ms: int = 1200,
-        poll_ms: int = 100,  # polling frequency for download collection
     ):
         save_dir = Path(save_dir)
         save_dir.mkdir(parents=True, exist_ok=True)
@@ -212,9 +417,11 @@ class BybitHistoryClient:
 
         # ---- Collect 1..N downloads triggered by the click ----
         downloads = []
+        new_download = asyncio.Event()
 
         def _on_download(d):
             downloads.append(d)
+            new_download.set()
 
         page.on("download", _on_download)
 
@@ -223,23 +430,16 @@ class BybitHistoryClient:
             async with page.expect_download(timeout=30_000):
                 await btn.click()
 
-            # Now collect any additional downloads that arrive shortly after
-            idle_ms = 0
-            last_count = len(downloads)
-            max_wait_ms = collect_window_ms
-
-            waited = 0
-            while waited < max_wait_ms:
-                await asyncio.sleep(poll_ms / 1000)
-                waited += poll_ms
-
-                if len(downloads) != last_count:
-                    last_count = len(downloads)
-                    idle_ms = 0
-                else:
-                    idle_ms += poll_ms
-                    if idle_ms >= collect_window_ms:
-                        break
+            # Now collect any additional downloads; stop once no new one
+            # arrives within collect_window_ms of the previous one
+            while True:
+                new_download.clear()
+                try:
+                    await asyncio.wait_for(
+                        new_download.wait(), timeout=collect_window_ms / 1000
+                    )
+                except asyncio.TimeoutError:
+                    break
 
         finally:
             page.remove_listener("download", _on_download)
@@ -248,7 +448,11 @@ class BybitHistoryClient:
         if not downloads:
             return []
 
-        out_paths: list[Path] = []
+        # register tasks in the caller's list right away, so none is lost if we are
+        # cancelled before returning
+        if unpack_tasks is None:
+            unpack_tasks = []
+        started: list[asyncio.Task[list[Path]]] = []
 
         for i, download in enumerate(downloads, start=1):
             suggested = download.suggested_filename or f"download_{i}.bin"
@@ -259,72 +463,49 @@ class BybitHistoryClient:
             out_path = save_dir / filename
 
             bar = DownloadTqdm(desc=out_path.name)
-            await bar.start(download)
+            await bar.start(download, download_events)
             try:
                 await download.save_as(str(out_path))
             finally:
                 await bar.stop(final_path=out_path)
 
-            produced: list[Path] = [out_path]
-
             # ---- Post-processing: unzip/ungzip automatically ----
-            # 1) If it's a ZIP, extract it (and delete zip), then gunzip any .gz inside
-            if out_path.suffix.lower() == ".zip":
-                extracted = []
-                with zipfile.ZipFile(out_path, "r") as z:
-                    for name in z.namelist():
-                        z.extract(name, path=save_dir)
-                        extracted.append(save_dir / name)
-                out_path.unlink(missing_ok=True)
-
-                # gunzip any .gz extracted
-                final_extracted: list[Path] = []
-                for p in extracted:
-                    if p.suffix.lower() == ".gz":
-                        final_extracted.append(gunzip_file(p, delete_original=True))
-                    else:
-                        final_extracted.append(p)
-
-                produced = final_extracted
-
-            # 2) If it's a .gz (csv.gz), gunzip and delete .gz
-            elif out_path.suffix.lower() == ".gz":
-                produced = [gunzip_file(out_path, delete_original=True)]
-
-            out_paths.extend(produced)
+            # runs in a worker thread so the next chunk's browser work can proceed
+            task = asyncio.create_task(
+                asyncio.to_thread(unpack_download, out_path, save_dir)
+            )
+            unpack_tasks.append(task)
+            started.append(task)
 
-        return out_paths
+        return started
 
     def _get_nth(
         self,
         margin: Literal["Spot", "Contract"],
         data_type: Literal["Trades", "L2Book"],
     ):
-        element_1 = "Public Trading History" if data_type == "Trades" else "OrderBook"
-        if margin == "Contract" and element_1 == "Public Trading History":
-            return 1
-        if margin == "Spot" and element_1 == "Public Trading History":
-            return 3
-        if margin == "Contract" and element_1 == "OrderBook":
-            return 4
-        if margin == "Spot" and element_1 == "OrderBook":
-            return 4
-
-    async def _get_symbols(self, _type: Literal["Contract", "Spot"]) -> List[str]:
-        if self.page is None:
-            raise RuntimeError(
-                "Client not started. Use: async with BybitHistoryClient(...) as c:"
-            )
+        return self._NTH_TABLE[(margin, data_type)]
 
-        page = self.page
+    async def _get_symbols_on_pool_page(
+        self, _type: Literal["Contract", "Spot"]
+    ) -> List[str]:
+        async with self._borrow_page() as page:
+            return await self._get_symbols(page, _type)
+
+    async def _get_symbols(
+        self, page: Page, _type: Literal["Contract", "Spot"]
+    ) -> List[str]:
+        self._configured.pop(page, None)
         await page.goto(
             self.BASE_HISTORY_URL,
             timeout=100_000,
             wait_until="domcontentloaded",
         )
-        await page.wait_for_load_state("networkidle", timeout=60_000)
+        await expect(
+            page.get_by_text("Public Trading History", exact=True)
+        ).to_be_visible(timeout=15_000)
         await self._hover(page, element="Public Trading History")
-        await self._click_first_visible_contract(page)
+        await self._click_first_visible_margin(page, margin=_type)
         select_root = page.locator(".ant-select").first
         await expect(select_root).to_be_visible(timeout=30_000)
         await select_root.click()
@@ -350,7 +531,6 @@ class BybitHistoryClient:
                 box["x"] + box["width"] * 0.5,
                 box["y"] + box["height"] * 0.5,
             )
-        await page.wait_for_timeout(400)
 
     @classmethod
     async def _attepth_click_visible_element(
@@ -365,9 +545,12 @@ class BybitHistoryClient:
         for attempt in range(1, max_attempts + 1):
             b = page.get_by_text(margin).nth(nth)
             try:
-                if not await b.is_visible():
-                    continue
+                # the submenu appears shortly after _hover
+                await b.wait_for(state="visible", timeout=delay_ms)
+            except PlaywrightTimeoutError:
+                continue
 
+            try:
                 await b.click(timeout=2_00)
                 return  # ✅ success
 
@@ -377,15 +560,21 @@ class BybitHistoryClient:
         raise RuntimeError("Failed to click a visible Contract button after retries")
 
     @classmethod
-    async def _click_first_visible_contract(
+    async def _click_first_visible_margin(
         cls,
         page,
         *,
+        margin: Literal["Spot", "Contract"] = "Contract",
         max_attempts: int = 20,
         delay_ms: int = 3000,
     ):
         for attempt in range(1, max_attempts + 1):
-            buttons = page.locator(".history-data__item-btn", has_text="Contract")
+            buttons = page.locator(".history-data__item-btn", has_text=margin)
+            # the submenu appears shortly after _hover
+            with contextlib.suppress(PlaywrightTimeoutError):
+                await page.locator(
+                    ".history-data__item-btn:visible", has_text=margin
+                ).first.wait_for(state="visible", timeout=delay_ms)
             count = await buttons.count()
 
             for i in range(count):
@@ -403,7 +592,7 @@ class BybitHistoryClient:
             # No successful click this round → wait and rescan
             await page.wait_for_timeout(delay_ms)
 
-        raise RuntimeError("Failed to click a visible Contract button after retries")
+        raise RuntimeError(f"Failed to click a visible {margin} button after retries")
 
     @classmethod
     async def _collect_ant_select_options(
@@ -414,7 +603,7 @@ class BybitHistoryClient:
         option_selector: str = ".ant-select-item-option-content",
         max_iters: int = 2000,
         idle_iters: int = 2000,
-        scroll_pause_ms: int = 10,
+        render_timeout_ms: int = 500,
     ) -> List[str]:
         """
         Collects all option texts from an Ant Design Select dropdown
@@ -426,36 +615,36 @@ class BybitHistoryClient:
         scroll_box = dropdown.locator(".rc-virtual-list-holder").first
         if await scroll_box.count() == 0:
             scroll_box = dropdown
+        box_handle = await scroll_box.element_handle()
 
         seen: Set[str] = set()
         no_progress = 0
 
-        for _ in range(max_iters):
-            # Collect visible options
-            texts = await dropdown.locator(option_selector).all_text_contents()
-            before_len = len(seen)
-
-            for t in texts:
+        async def _collect_visible() -> None:
+            for t in await dropdown.locator(option_selector).all_text_contents():
                 t = t.strip()
                 if t:
                     seen.add(t)
 
-            # Read scroll state before scroll
-            before_top, scroll_height, client_height = await scroll_box.evaluate(
-                "(el) => [el.scrollTop, el.scrollHeight, el.clientHeight]"
-            )
-
-            # Scroll down
-            await scroll_box.evaluate(
-                "(el) => { el.scrollTop = el.scrollTop + el.clientHeight * 0.9; }"
-            )
-
-            # Allow virtual list to recycle DOM nodes
-            await page.wait_for_timeout(scroll_pause_ms)
-
-            # Read scroll state after scroll
-            after_top, _, _ = await scroll_box.evaluate(
-                "(el) => [el.scrollTop, el.scrollHeight, el.clientHeight]"
+        for _ in range(max_iters):
+            # Collect visible options
+            before_len = len(seen)
+            await _collect_visible()
+
+            # Scroll down and read scroll state (plus the first mounted row,
+            # to detect re-rendering) in a single round-trip
+            (
+                before_top,
+                after_top,
+                scroll_height,
+                client_height,
+                first_text,
+            ) = await box_handle.evaluate(
+                "(el, sel) => { const f = el.querySelector(sel)?.textContent ?? null;"
+                " const b = el.scrollTop;"
+                " el.scrollTop = b + el.clientHeight * 0.9;"
+                " return [b, el.scrollTop, el.scrollHeight, el.clientHeight, f]; }",
+                option_selector,
             )
 
             # Progress detection
@@ -463,12 +652,26 @@ class BybitHistoryClient:
             scrolled_any = after_top > before_top
             at_bottom = after_top >= (scroll_height - client_height - 2)
 
+            if scrolled_any:
+                # Allow virtual list to recycle DOM nodes: wait until the rows change
+                try:
+                    await page.wait_for_function(
+                        "([el, sel, prev]) =>"
+                        " (el.querySelector(sel)?.textContent ?? null) !== prev",
+                        arg=[box_handle, option_selector, first_text],
+                        timeout=render_timeout_ms,
+                    )
+                except PlaywrightTimeoutError:
+                    pass
+
             if not added_any and not scrolled_any:
                 no_progress += 1
             else:
                 no_progress = 0
 
             if at_bottom:
+                # rows revealed by the last scroll have not been collected yet
+                await _collect_visible()
                 break
 
             if no_progress >= idle_iters:
@@ -497,7 +700,12 @@ class BybitHistoryClient:
         await selector.click()
         return page
 
-    async def _select_virtual_option(self, page, text: str, max_tries: int = 80):
+    async def _select_virtual_option(
+        self,
+        page,
+        text: str,
+        mount_timeout_ms: int = 200,
+    ):
         import re
 
         dropdown = page.locator(".ant-select-dropdown:not(.ant-select-dropdown-hidden)")
@@ -519,32 +727,57 @@ class BybitHistoryClient:
             "xpath=ancestor::*[contains(@class,'ant-select-item-option')]"
         )
 
-        last_scroll_top = None
-
-        for _ in range(max_tries):
+        async def _click_if_mounted() -> bool:
             # If the row is mounted, it will become visible
-            if await content.first.is_visible():
-                await option_wrapper.first.scroll_into_view_if_needed()
-                await option_wrapper.first.click()
-                return True
-
-            # scroll the holder a bit (virtual list)
-            scroll_top = await holder.evaluate("el => el.scrollTop")
-            if last_scroll_top is not None and abs(scroll_top - last_scroll_top) < 1:
-                # no more scrolling possible (hit end)
+            try:
+                await content.first.wait_for(state="visible", timeout=mount_timeout_ms)
+            except PlaywrightTimeoutError:
                 return False
-            last_scroll_top = scroll_top
+            await option_wrapper.first.scroll_into_view_if_needed()
+            await option_wrapper.first.click()
+            return True
 
-            await holder.evaluate("el => { el.scrollTop += 60; }")
-            await page.wait_for_timeout(40)
+        if await _click_if_mounted():
+            return True
+
+        # Jump straight to a few offsets of the virtual list instead of
+        # creeping through it: 10%, 25%, 50%, 75%, bottom
+        scroll_height, client_height = await holder.evaluate(
+            "el => [el.scrollHeight, el.clientHeight]"
+        )
+        max_top = max(scroll_height - client_height, 0)
+        if max_top == 0:
+            return False
+
+        tried: Set[int] = set()
+        for frac in (0.1, 0.25, 0.5, 0.75, 1.0):
+            top = int(max_top * frac)
+            tried.add(top)
+            await holder.evaluate("(el, top) => { el.scrollTop = top; }", top)
+            if await _click_if_mounted():
+                return True
+
+        # Fall back to sweeping the list one viewport at a time
+        step = max(int(client_height * 0.9), 1)
+        for top in range(0, max_top + step, step):
+            top = min(top, max_top)
+            if top in tried:
+                continue
+            tried.add(top)
+            await holder.evaluate("(el, top) => { el.scrollTop = top; }", top)
+            if await _click_if_mounted():
+                return True
 
         return False
 
     def _print_symbols(self, label: str, symbols: list[str]):
-        print(f"\n=== {label} SYMBOLS ({len(symbols)}) ===")
-        for s in sorted(symbols):
-            print(s)
-        print(f"=== END {label} SYMBOLS ===\n")
+        # symbols come sorted from _collect_ant_select_options; write them in one go
+        sys.stdout.write(
+            f"\n=== {label} SYMBOLS ({len(symbols)}) ===\n"
+            + "".join(f"{s}\n" for s in symbols)
+            + f"=== END {label} SYMBOLS ===\n\n"
+        )
+        sys.stdout.flush()
 
     async def _dump_all_dropdown_options(self, page):
         dropdown = page.locator(".ant-select-dropdown:visible")
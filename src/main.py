@@ -21,6 +21,12 @@ def _norm_margin(s: str) -> Margin:
     raise argparse.ArgumentTypeError("margin must be 'spot' or 'contract'")
 
 
+def _norm_symbols_margin(s: str) -> Margin | Literal["All"]:
+    if s.strip().lower() == "all":
+        return "All"
+    return _norm_margin(s)
+
+
 def _norm_dtype(s: str) -> DataType:
     s = s.strip().lower()
     if s in ("trades", "trade"):
@@ -42,12 +48,18 @@ def build_parser() -> argparse.ArgumentParser:
         default=True,
         help="Run browser headless (default: true). Use --no-headless to see UI.",
     )
+    p.add_argument(
+        "--block-resources",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Skip images, fonts, media and trackers (default: true).",
+    )
 
     sub = p.add_subparsers(dest="cmd", required=True)
 
     # ---- symbols ----
     ps = sub.add_parser("symbols", help="List available symbols.")
-    ps.add_argument("margin", type=_norm_margin, help="spot|contract")
+    ps.add_argument("margin", type=_norm_symbols_margin, help="spot|contract|all")
 
     # ---- download ----
     pd = sub.add_parser("download", help="Download data.")
@@ -63,15 +75,25 @@ def build_parser() -> argparse.ArgumentParser:
         default=5,
         help="Chunk size in days (must be < 6)",
     )
+    pd.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of chunks downloaded concurrently (default: 4)",
+    )
 
     return p
 
 
 async def _run_symbols(args) -> int:
     async with BybitHistoryClient(
-        headless=args.headless, browser_name=args.browser
+        headless=args.headless,
+        browser_name=args.browser,
+        block_resources=args.block_resources,
     ) as c:
-        if args.margin == "Spot":
+        if args.margin == "All":
+            await c.show_all_symbols()
+        elif args.margin == "Spot":
             await c.show_spot_symbols()
         else:
             await c.show_contract_symbols()
@@ -81,12 +103,17 @@ async def _run_symbols(args) -> int:
 async def _run_download(args, parser: argparse.ArgumentParser) -> int:
     if args.chunk_days >= 6:
         parser.error("chunk-days must be < 6")
+    if args.workers <= 0:
+        parser.error("workers must be > 0")
 
     out_dir = Path(args.out)
     out_dir.mkdir(parents=True, exist_ok=True)
 
     async with BybitHistoryClient(
-        headless=args.headless, browser_name=args.browser
+        headless=args.headless,
+        browser_name=args.browser,
+        n_workers=args.workers,
+        block_resources=args.block_resources,
     ) as c:
         await c.download_data(
             margin=args.margin,
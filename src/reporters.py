@@ -2,21 +2,78 @@
 from __future__ import annotations
 
 import asyncio
-import contextlib
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 from tqdm import tqdm
 
 
+class CdpDownloadProgress:
+    """
+    Relays Chromium's CDP `Page.downloadProgress` events to per-download listeners.
+
+    CDP identifies downloads by guid, Playwright by URL; the mapping is learned
+    from `Page.downloadWillBegin`. Only available on Chromium: `attach()` returns
+    None on other browsers.
+    """
+
+    def __init__(self, session):
+        self._session = session
+        self._url_by_guid: dict[str, str] = {}
+        # last event per URL, so a late subscriber can catch up
+        self._latest: dict[str, dict] = {}
+        self._listeners: dict[str, Callable[[dict], None]] = {}
+
+        session.on("Page.downloadWillBegin", self._on_will_begin)
+        session.on("Page.downloadProgress", self._on_progress)
+
+    @classmethod
+    async def attach(cls, page) -> Optional[CdpDownloadProgress]:
+        try:
+            session = await page.context.new_cdp_session(page)
+            await session.send("Page.enable")
+        except Exception:
+            return None
+        return cls(session)
+
+    def subscribe(self, url: str, listener: Callable[[dict], None]) -> None:
+        self._listeners[url] = listener
+        latest = self._latest.get(url)
+        if latest is not None:
+            listener(latest)
+
+    def unsubscribe(self, url: str) -> None:
+        self._listeners.pop(url, None)
+        self._latest.pop(url, None)
+
+    def _on_will_begin(self, params: dict) -> None:
+        self._url_by_guid[params["guid"]] = params.get("url", "")
+
+    def _on_progress(self, params: dict) -> None:
+        guid = params.get("guid")
+        url = self._url_by_guid.get(guid)
+        if url is None:
+            return
+        if params.get("state") != "inProgress":
+            self._url_by_guid.pop(guid, None)
+
+        self._latest[url] = params
+        listener = self._listeners.get(url)
+        if listener is not None:
+            listener(params)
+
+
 class DownloadTqdm:
     """
     Minimal async progress bar for Playwright downloads.
 
+    The bar is driven by CDP progress events when `events` is given (Chromium);
+    otherwise it is completed from the saved file size on stop().
+
     Usage:
         bar = DownloadTqdm(desc="file.csv")
-        await bar.start(download)
+        await bar.start(download, events)
         try:
             await download.save_as(path)
         finally:
@@ -31,29 +88,30 @@ class DownloadTqdm:
         unit_scale: bool = True,
         unit_divisor: int = 1024,
         mininterval: float = 0.2,
+        finish_timeout: float = 2.0,
     ):
         self.desc = desc
         self._bar: Optional[tqdm] = None
-        self._task: Optional[asyncio.Task] = None
+        self._events: Optional[CdpDownloadProgress] = None
+        self._url: Optional[str] = None
 
         self._unit = unit
         self._unit_scale = unit_scale
         self._unit_divisor = unit_divisor
         self._mininterval = mininterval
+        self._finish_timeout = finish_timeout
 
         self._last_bytes = 0
         self._start_ts = 0.0
         self._done = asyncio.Event()
 
-    async def start(self, download) -> None:
-        # total_bytes() may be unknown; that's fine (tqdm total=None)
-        try:
-            total = await download.total_bytes()
-        except Exception:
-            total = None
-
+    async def start(
+        self,
+        download,
+        events: Optional[CdpDownloadProgress] = None,
+    ) -> None:
         self._bar = tqdm(
-            total=total,
+            total=None,
             desc=self.desc,
             unit=self._unit,
             unit_scale=self._unit_scale,
@@ -66,44 +124,55 @@ class DownloadTqdm:
         self._last_bytes = 0
         self._done.clear()
 
-        async def _poll() -> None:
-            while not self._done.is_set():
-                try:
-                    info = await download.progress()
-                    current = int(info.get("bytes", 0) or 0)
-                except Exception:
-                    current = self._last_bytes
+        if events is not None:
+            self._events = events
+            self._url = download.url
+            events.subscribe(self._url, self._on_progress)
+
+    def _on_progress(self, params: dict) -> None:
+        if self._bar is None:
+            return
 
-                delta = current - self._last_bytes
-                if delta > 0 and self._bar is not None:
-                    self._bar.update(delta)
-                    self._last_bytes = current
+        total = int(params.get("totalBytes", 0) or 0)
+        if self._bar.total is None and total > 0:
+            self._bar.total = total
+            self._bar.refresh()
 
-                await asyncio.sleep(self._mininterval)
+        current = int(params.get("receivedBytes", 0) or 0)
+        delta = current - self._last_bytes
+        if delta > 0:
+            self._bar.update(delta)
+            self._last_bytes = current
 
-        self._task = asyncio.create_task(_poll())
+        if params.get("state") != "inProgress":
+            self._done.set()
 
     async def stop(self, *, final_path: Optional[str | Path] = None) -> None:
+        if self._events is not None and self._url is not None:
+            # save_as() only returns once the download finished, so the final
+            # event is normally already here; don't hang if it never comes
+            try:
+                await asyncio.wait_for(self._done.wait(), self._finish_timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._events.unsubscribe(self._url)
+            self._events = None
+            self._url = None
         self._done.set()
 
-        if self._task is not None:
-            self._task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await self._task
-            self._task = None
-
         # IMPORTANT: never do `if self._bar:` because tqdm.__bool__ can raise
         if self._bar is not None:
-            # If tqdm knew the total and we didn't reach it, try to finish cleanly
+            # Finish cleanly from whatever we know about the final size
             try:
                 total = self._bar.total
+                if total is None and final_path is not None:
+                    total = Path(final_path).stat().st_size
+                    self._bar.total = total
                 if total is not None and self._last_bytes < total:
                     self._bar.update(total - self._last_bytes)
+                    self._last_bytes = total
             except Exception:
                 pass
 
             self._bar.close()
             self._bar = None
-
-        # final_path is kept only to match your call-site signature
-        _ = final_path
@@ -1,66 +1,798 @@
+import errno
 import gzip
-import re
-import shutil
-from datetime import datetime, timedelta
-from pathlib import Path
-from typing import List, Tuple
+import io
+import mmap
+import os
+import struct
+import sys
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+from functools import lru_cache, partial
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Iterable, List, Optional, Tuple
+
+import pytest
+
+try:
+    # ISA-L's igzip: drop-in gzip replacement with a much faster inflate
+    from isal import igzip as _gzip
+except ImportError:
+    _gzip = gzip
+
+try:
+    # libdeflate bindings: fastest inflate, but needs the whole file in memory
+    import deflate
+except ImportError:
+    deflate = None
+
+# chunk size for streaming copies; the stdlib default (64 KiB) means many more
+# read/write calls on multi-MB trade dumps
+COPY_BUFSIZE = 1 << 20
+
+# outputs at least this big are synced and dropped from the page cache once
+# written; fdatasync stalls the writer, which smaller files are not worth
+DROP_CACHE_MIN = 16 << 20
+
+# O_DIRECT needs offsets, sizes and buffer addresses aligned to the block size
+_DIRECT_IO_ALIGN = 4096
+
+# largest .gz (compressed size) decompressed in one buffer with libdeflate;
+# bigger files are streamed to keep memory bounded
+WHOLE_BUFFER_MAX = 64 << 20
+
+# same for the decompressed size (from the gzip trailer): L2 book dumps compress
+# so well that a .gz under WHOLE_BUFFER_MAX can still inflate to over 1 GiB
+WHOLE_OUTPUT_MAX = 256 << 20
+
+# bound once to skip the attribute lookups on the date-splitting paths
+_FROMISO = date.fromisoformat
+_FROMORD = date.fromordinal
+
+# above this many chunks split_date_range builds them with NumPy, if installed
+NUMPY_MIN_CHUNKS = 1024
+
+
+def open_gzip(gz_path: str | Path) -> BinaryIO:
+    """
+    Open a .gz for streaming reads of the decompressed bytes, e.g.
+    csv.reader(io.TextIOWrapper(open_gzip(path))). Use this instead of
+    gunzip_file when the data is consumed right away and never needs to
+    exist on disk uncompressed.
+    """
+    return _gzip.open(gz_path, "rb")
 
 
 def gunzip_file(
     gz_path: str | Path,
     *,
     delete_original: bool = True,
+    buffer_size: int = COPY_BUFSIZE,
+    direct_io: bool = False,
 ) -> Path:
-    gz_path = Path(gz_path)
+    """
+    Decompress gz_path next to itself (dropping the .gz suffix).
+
+    Outputs of at least DROP_CACHE_MIN bytes are flushed to disk and dropped
+    from the page cache once written. With direct_io=True (Linux), streamed
+    output bypasses the page cache entirely via O_DIRECT, falling back to
+    buffered writes where the filesystem rejects it.
+    """
+    if not isinstance(gz_path, Path):
+        gz_path = Path(gz_path)
     out_path = gz_path.with_suffix("")  # removes .gz
 
-    with gzip.open(gz_path, "rb") as f_in, open(out_path, "wb") as f_out:
-        shutil.copyfileobj(f_in, f_out)
+    data = None
+    if deflate is not None and _fits_whole_buffer(gz_path):
+        data = _inflate_single_member(gz_path.read_bytes())
+    if data is not None:
+        _write_bytes(out_path, data)
+    else:
+        _gunzip_stream(gz_path, out_path, buffer_size, direct_io)
 
     if delete_original:
-        gz_path.unlink()
+        gz_path.unlink(missing_ok=True)
 
     return out_path
 
 
+def _fits_whole_buffer(gz_path: Path) -> bool:
+    """
+    Whether gz_path is small enough, compressed and decompressed, for
+    _inflate_single_member. ISIZE is the output size mod 2**32; an output that
+    wrapped around does not fit the buffer libdeflate sizes from it, fails
+    there and is streamed instead.
+    """
+    size = gz_path.stat().st_size
+    if size < 18 or size > WHOLE_BUFFER_MAX:  # 18: gzip header + trailer
+        return False
+    with open(gz_path, "rb") as f:
+        f.seek(-4, os.SEEK_END)
+        return int.from_bytes(f.read(4), "little") <= WHOLE_OUTPUT_MAX
+
+
+def _inflate_single_member(gz_data: bytes) -> Optional[bytes]:
+    """
+    Decompress a whole single-member gzip with libdeflate. Returns None when
+    the streaming path has to do it instead: corrupt data (reported there),
+    or more than one member.
+
+    libdeflate decodes the first member only and sizes its output from the
+    last 4 bytes, i.e. the last member's ISIZE, so a multi-member file whose
+    first and last members have the same length decodes "successfully" to
+    just the first member. With ISIZE 0 (e.g. zero padding after the trailer,
+    or a truncated download with a zero-filled tail) it returns b"" without
+    inflating anything; such files, and genuinely empty ones, are streamed.
+    """
+    if gz_data[-4:] == b"\0\0\0\0":
+        return None
+    try:
+        out = deflate.gzip_decompress(gz_data)
+    except (deflate.DeflateError, ValueError):
+        # ValueError: not gzip at all (e.g. an HTML error page saved as .gz)
+        return None
+    # libdeflate verified the first member's trailer (CRC32, ISIZE) against
+    # `out`; that member is the only one iff its trailer is the file's last
+    # 8 bytes and does not also appear followed by another member's header
+    # (same-content members). deflate.crc32 is libdeflate's PCLMULQDQ/ARM CRC32,
+    # so recomputing it here costs a small fraction of the inflate itself.
+    trailer = struct.pack("<II", deflate.crc32(out), len(out) & 0xFFFFFFFF)
+    if not gz_data.endswith(trailer) or gz_data.find(trailer + b"\x1f\x8b") != -1:
+        return None
+    return out
+
+
+def gunzip_files(
+    gz_paths: Iterable[str | Path],
+    *,
+    workers: Optional[int] = None,
+    delete_original: bool = True,
+) -> List[Path]:
+    """
+    gunzip_file over many files, spread across worker processes
+    (inflate is CPU-bound). Returns the output paths in input order.
+    """
+    gz_paths = list(gz_paths)
+    workers = min(workers or os.cpu_count() or 1, len(gz_paths))
+    job = partial(gunzip_file, delete_original=delete_original)
+    if workers <= 1:
+        return [job(p) for p in gz_paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(job, gz_paths))
+
+
+def _copy_stream(f_in, f_out, buffer_size: int) -> None:
+    """
+    Like shutil.copyfileobj, but reads into one reusable buffer instead of
+    allocating a new bytes object per chunk.
+    """
+    buf = bytearray(buffer_size)
+    view = memoryview(buf)
+    while True:
+        n = f_in.readinto(buf)
+        if not n:
+            break
+        f_out.write(view[:n])
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    """
+    Write a whole buffer straight to the file descriptor, reserving the full
+    size up front so the filesystem can allocate it in one extent.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        if data and hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(fd, 0, len(data))
+            except OSError:
+                pass  # not supported by this filesystem
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+        _drop_page_cache(fd, len(data))
+    finally:
+        os.close(fd)
+
+
+def _drop_page_cache(fd: int, size: int) -> None:
+    """
+    Evict a just-written file of `size` bytes from the page cache (best effort).
+    DONTNEED skips dirty pages, so the data is written back with fdatasync first.
+    """
+    if size < DROP_CACHE_MIN or not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.fdatasync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass
+
+
+def _gunzip_stream(
+    gz_path: Path,
+    out_path: Path,
+    buffer_size: int,
+    direct_io: bool = False,
+) -> None:
+    if direct_io and _gunzip_stream_direct(gz_path, out_path, buffer_size):
+        return
+
+    with _gzip.open(gz_path, "rb") as f_in, open(
+        out_path, "wb", buffering=buffer_size
+    ) as f_out:
+        _copy_stream(f_in, f_out, buffer_size)
+        f_out.flush()
+        _drop_page_cache(f_out.fileno(), f_out.tell())
+
+
+def _gunzip_stream_direct(gz_path: Path, out_path: Path, buffer_size: int) -> bool:
+    """
+    _gunzip_stream through O_DIRECT. Returns False, leaving out_path to be
+    rewritten from the start, when the filesystem refuses O_DIRECT.
+    """
+    if not hasattr(os, "O_DIRECT"):
+        return False
+    try:
+        fd = os.open(
+            out_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_DIRECT, 0o666
+        )
+    except OSError:
+        return False  # e.g. tmpfs, which does not support O_DIRECT
+
+    try:
+        with _gzip.open(gz_path, "rb") as f_in:
+            _copy_stream_direct(f_in, fd, buffer_size)
+    except OSError as e:
+        # opened fine, but the writes need a different alignment than ours
+        if e.errno != errno.EINVAL:
+            raise
+        return False
+    finally:
+        os.close(fd)
+    return True
+
+
+def _copy_stream_direct(f_in, fd: int, buffer_size: int) -> None:
+    """
+    _copy_stream for a descriptor opened with O_DIRECT: every write is a whole
+    number of aligned blocks from a page-aligned (mmap) buffer; the padding of
+    the last block is cut off again with ftruncate.
+    """
+    size = max(buffer_size - buffer_size % _DIRECT_IO_ALIGN, _DIRECT_IO_ALIGN)
+    buf = mmap.mmap(-1, size)
+    view = memoryview(buf)
+    total = 0
+    try:
+        while True:
+            filled = 0
+            while filled < size:
+                # sub-views are released at once: a live one (e.g. held by an
+                # exception's traceback) would make buf.close() fail below
+                with view[filled:] as free:
+                    n = f_in.readinto(free)
+                if not n:
+                    break
+                filled += n
+            if not filled:
+                break
+
+            end = -(-filled // _DIRECT_IO_ALIGN) * _DIRECT_IO_ALIGN
+            view[filled:end] = bytes(end - filled)
+            written = 0
+            while written < end:
+                with view[written:end] as pending:
+                    written += os.write(fd, pending)
+            total += filled
+            if filled < size:
+                break
+
+        os.ftruncate(fd, total)
+    finally:
+        view.release()
+        buf.close()
+
+
+def extract_zip(
+    zip_path: str | Path,
+    save_dir: str | Path,
+    *,
+    delete_original: bool = True,
+    max_workers: Optional[int] = None,
+) -> List[Path]:
+    """
+    Extract every member of a ZIP into save_dir, gunzipping .gz members on the fly
+    (the intermediate .gz is never written to disk).
+
+    Members are processed in parallel threads. Returns the produced paths.
+    """
+    zip_path = Path(zip_path)
+    save_dir = Path(save_dir)
+
+    with zipfile.ZipFile(zip_path, "r") as z:
+        members = [zi for zi in z.infolist() if not zi.is_dir()]
+
+        def _extract_member(zi: zipfile.ZipInfo) -> Path:
+            # same sanitising as ZipFile.extract: no absolute paths or '..'
+            parts = [
+                p for p in PurePosixPath(zi.filename).parts if p not in ("/", ".", "..")
+            ]
+            target = save_dir.joinpath(*parts)
+            target.parent.mkdir(parents=True, exist_ok=True)
+
+            with z.open(zi, "r") as src:
+                if target.suffix.lower() == ".gz":
+                    target = target.with_suffix("")  # removes .gz
+                    with _gzip.open(src, "rb") as f_in, open(
+                        target, "wb", buffering=COPY_BUFSIZE
+                    ) as f_out:
+                        _copy_stream(f_in, f_out, COPY_BUFSIZE)
+                else:
+                    with open(target, "wb", buffering=COPY_BUFSIZE) as f_out:
+                        _copy_stream(src, f_out, COPY_BUFSIZE)
+            return target
+
+        workers = max_workers or min(8, os.cpu_count() or 1)
+        if len(members) <= 1 or workers <= 1:
+            produced = [_extract_member(zi) for zi in members]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                produced = list(pool.map(_extract_member, members))
+
+    if delete_original:
+        zip_path.unlink(missing_ok=True)
+
+    return produced
+
+
+def unpack_download(path: str | Path, save_dir: str | Path) -> List[Path]:
+    """
+    Unpack a downloaded file in place: ZIPs are extracted (and their .gz members
+    gunzipped), a bare .gz is gunzipped. Originals are deleted.
+    Returns the produced paths.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".zip":
+        return extract_zip(path, save_dir, delete_original=True)
+    if suffix == ".gz":
+        return [gunzip_file(path, delete_original=True)]
+    return [path]
+
+
+def _is_date_shape(s: str) -> bool:
+    """
+    Zero-padded YYYY-MM-DD layout check; the values are validated by parsing.
+    Needed because date.fromisoformat also accepts other ISO forms (e.g. 20260101).
+    """
+    return (
+        len(s) == 10
+        and s.isascii()
+        and s[4] == "-"
+        and s[7] == "-"
+        and s[:4].isdigit()
+        and s[5:7].isdigit()
+        and s[8:].isdigit()
+    )
+
+
+@lru_cache(maxsize=16384)
+def _iso_from_ord(o: int) -> str:
+    # fixed-width formatting, cheaper than strftime("%Y-%m-%d"); cached because
+    # adjacent/overlapping windows format the same boundary days again
+    d = _FROMORD(o)
+    return f"{d.year:04d}-{d.month:02d}-{d.day:02d}"
+
+
+@lru_cache(maxsize=256)
 def split_date_range(
     start_date: str,
     end_date: str,
     n: int,
-) -> List[Tuple[str, str]]:
+) -> Tuple[Tuple[str, str], ...]:
     """
     Split an inclusive date range [start_date, end_date] into chunks of at most n days.
 
     - Dates MUST be in 'YYYY-MM-DD' format (zero-padded).
     - Raises ValueError on invalid format or logical errors.
+    - Results are cached, hence returned as an immutable tuple.
     """
-    _DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
-    if not _DATE_RE.match(start_date):
+    s, e = _parse_date_range(start_date, end_date, n)
+    if (e - s) // n + 1 > NUMPY_MIN_CHUNKS:
+        vectorised = _split_date_range_numpy(_FROMORD(s), _FROMORD(e), n)
+        if vectorised is not None:
+            return vectorised
+
+    return tuple(
+        [(_iso_from_ord(a), _iso_from_ord(b)) for a, b in _chunk_ordinals(s, e, n)]
+    )
+
+
+@lru_cache(maxsize=256)
+def split_date_range_objs(
+    start_date: str,
+    end_date: str,
+    n: int,
+) -> Tuple[Tuple[date, date], ...]:
+    """
+    Same as split_date_range, but returns `date` objects, for callers that do
+    further date math and would otherwise re-parse the strings.
+    """
+    s, e = _parse_date_range(start_date, end_date, n)
+    fromordinal = _FROMORD
+    return tuple(
+        [(fromordinal(a), fromordinal(b)) for a, b in _chunk_ordinals(s, e, n)]
+    )
+
+
+def _parse_date_range(start_date: str, end_date: str, n: int) -> Tuple[int, int]:
+    """Validate split_date_range arguments; returns the bounds as day ordinals."""
+    if not _is_date_shape(start_date):
         raise ValueError(f"start_date must be 'YYYY-MM-DD' (got {start_date!r})")
-    if not _DATE_RE.match(end_date):
+    if not _is_date_shape(end_date):
         raise ValueError(f"end_date must be 'YYYY-MM-DD' (got {end_date!r})")
 
     if n <= 0:
         raise ValueError("n must be a positive integer (days per chunk)")
 
-    fmt = "%Y-%m-%d"
-
     try:
-        start = datetime.strptime(start_date, fmt).date()
-        end = datetime.strptime(end_date, fmt).date()
+        start = _FROMISO(start_date)
     except ValueError as e:
         # Catches invalid dates like 2026-02-30
-        raise ValueError(f"Invalid date value: {e}") from None
+        raise ValueError(f"Invalid date value {start_date!r}: {e}") from None
+    try:
+        end = _FROMISO(end_date)
+    except ValueError as e:
+        raise ValueError(f"Invalid date value {end_date!r}: {e}") from None
 
     if start > end:
         raise ValueError("start_date must be <= end_date")
 
-    out: List[Tuple[str, str]] = []
-    cur = start
+    return start.toordinal(), end.toordinal()
 
-    while cur <= end:
-        chunk_end = min(cur + timedelta(days=n - 1), end)
-        out.append((cur.strftime(fmt), chunk_end.strftime(fmt)))
-        cur = chunk_end + timedelta(days=1)
 
+def _chunk_ordinals(s: int, e: int, n: int) -> List[Tuple[int, int]]:
+    # step over integer day ordinals instead of adding timedeltas
+    out: List[Tuple[int, int]] = []
+    while s <= e:
+        ce = s + n - 1
+        if ce > e:
+            ce = e
+        out.append((s, ce))
+        s = ce + 1
     return out
+
+
+def _split_date_range_numpy(
+    start: date,
+    end: date,
+    n: int,
+) -> Optional[Tuple[Tuple[str, str], ...]]:
+    """Vectorised split_date_range body; None when NumPy is not available."""
+    try:
+        import numpy as np  # imported lazily: only worth it for long ranges
+    except ImportError:
+        return None
+
+    last = np.datetime64(end, "D")
+    starts = np.arange(np.datetime64(start, "D"), last + 1, n)
+    ends = np.minimum(starts + (n - 1), last)
+    return tuple(
+        zip(
+            np.datetime_as_string(starts, unit="D").tolist(),
+            np.datetime_as_string(ends, unit="D").tolist(),
+        )
+    )
+
+
+# -------------------------
+# Pytest (same module)
+# Run: pytest -q src/utils.py
+# -------------------------
+
+
+@pytest.mark.skipif(deflate is None, reason="needs the deflate package")
+@pytest.mark.parametrize(
+    "members",
+    [
+        [b"a" * 1000],
+        [b""],
+        [b"a" * 1000, b"b" * 1000],  # same ISIZE: libdeflate alone drops "b"s
+        [b"a" * 1000, b"a" * 1000],  # same trailer too
+        [b"a" * 1000, b"b" * 10],
+        [b"a" * 1000, b"", b"c" * 1000],
+    ],
+)
+def test_gunzip_file_multi_member(tmp_path, members):
+    gz_path = tmp_path / "data.csv.gz"
+    gz_path.write_bytes(b"".join(gzip.compress(m) for m in members))
+
+    out_path = gunzip_file(gz_path)
+
+    assert out_path == tmp_path / "data.csv"
+    assert out_path.read_bytes() == b"".join(members)
+    assert not gz_path.exists()
+    # only single-member, non-empty files take the in-memory libdeflate path
+    whole = _inflate_single_member(b"".join(gzip.compress(m) for m in members))
+    assert (whole is not None) == (members in ([b"a" * 1000],))
+
+
+def test_gunzip_file_zero_padded(tmp_path):
+    # gzip -dc and stdlib gzip skip zero padding after the last member;
+    # libdeflate would read ISIZE 0 from it and return b""
+    payload = b"a,b\n1,2\n" * 100
+    gz_path = tmp_path / "data.csv.gz"
+    gz_path.write_bytes(gzip.compress(payload) + bytes(8))
+
+    assert gunzip_file(gz_path).read_bytes() == payload
+
+
+def test_fits_whole_buffer_checks_decompressed_size(tmp_path, monkeypatch):
+    gz_path = tmp_path / "data.csv.gz"
+    gz_path.write_bytes(gzip.compress(bytes(1 << 20)))  # ~1 KiB -> 1 MiB
+    assert _fits_whole_buffer(gz_path)
+
+    monkeypatch.setattr(sys.modules[__name__], "WHOLE_OUTPUT_MAX", (1 << 20) - 1)
+    assert not _fits_whole_buffer(gz_path)
+    assert gunzip_file(gz_path).read_bytes() == bytes(1 << 20)
+
+
+def test_gunzip_file_not_gzip_raises(tmp_path):
+    gz_path = tmp_path / "data.csv.gz"
+    gz_path.write_bytes(b"<html><body>502 Bad Gateway</body></html>")
+
+    # same error with or without deflate installed
+    with pytest.raises(gzip.BadGzipFile):
+        gunzip_file(gz_path)
+    assert gz_path.exists()
+
+
+def test_gunzip_file_corrupt_raises(tmp_path):
+    gz_path = tmp_path / "data.csv.gz"
+    data = bytearray(gzip.compress(os.urandom(4096)))
+    data[-8] ^= 0xFF  # break the CRC32
+    gz_path.write_bytes(bytes(data))
+
+    with pytest.raises(gzip.BadGzipFile):
+        gunzip_file(gz_path)
+    assert gz_path.exists()
+
+
+@pytest.mark.parametrize("zeroed", [8, 100, 1000])
+def test_gunzip_file_truncated_zero_tail_raises(tmp_path, zeroed):
+    # a partial download into a preallocated file: the tail is still zeros
+    data = bytearray(gzip.compress(os.urandom(4096)))  # stored blocks
+    data[-zeroed:] = bytes(zeroed)
+    gz_path = tmp_path / "data.csv.gz"
+    gz_path.write_bytes(bytes(data))
+
+    with pytest.raises(gzip.BadGzipFile):
+        gunzip_file(gz_path)
+    assert gz_path.exists()
+
+
+def test_gunzip_file_direct_io_falls_back_on_einval(tmp_path, monkeypatch):
+    payload = os.urandom(3 * _DIRECT_IO_ALIGN + 5)
+    gz_path = tmp_path / "data.csv.gz"
+    gz_path.write_bytes(gzip.compress(payload))
+
+    def _reject(fd, data):
+        raise OSError(errno.EINVAL, "Invalid argument")
+
+    # O_DIRECT open succeeds but the filesystem rejects the aligned writes
+    monkeypatch.setattr(os, "write", _reject)
+    monkeypatch.setattr(sys.modules[__name__], "deflate", None)
+
+    out_path = gunzip_file(gz_path, direct_io=True)
+
+    assert out_path.read_bytes() == payload
+
+
+class _TrickleReader(io.BytesIO):
+    """BytesIO whose readinto returns at most `step` bytes, like a slow decoder."""
+
+    def __init__(self, data: bytes, step: int):
+        super().__init__(data)
+        self._step = step
+
+    def readinto(self, b) -> int:
+        with memoryview(b) as view:
+            return super().readinto(view[: self._step])
+
+
+@pytest.mark.skipif(not hasattr(os, "O_DIRECT"), reason="needs O_DIRECT")
+@pytest.mark.parametrize(
+    "size",
+    [
+        0,
+        1,
+        _DIRECT_IO_ALIGN - 1,
+        _DIRECT_IO_ALIGN,
+        _DIRECT_IO_ALIGN + 1,
+        COPY_BUFSIZE - 1,
+        COPY_BUFSIZE,
+        COPY_BUFSIZE + 1,
+        3 * COPY_BUFSIZE + 17,
+    ],
+)
+@pytest.mark.parametrize("step", [None, 1000, _DIRECT_IO_ALIGN * 3 + 1])
+@pytest.mark.parametrize("buffer_size", [COPY_BUFSIZE, 5000, 100])
+def test_copy_stream_direct_boundaries(tmp_path, size, step, buffer_size):
+    payload = os.urandom(size)
+    f_in = io.BytesIO(payload) if step is None else _TrickleReader(payload, step)
+    out_path = tmp_path / "out.bin"
+    try:
+        fd = os.open(out_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_DIRECT)
+    except OSError:
+        pytest.skip("filesystem does not support O_DIRECT")
+
+    try:
+        _copy_stream_direct(f_in, fd, buffer_size)
+    finally:
+        os.close(fd)
+
+    # the zero padding of the last block must be cut off again
+    assert out_path.stat().st_size == size
+    assert out_path.read_bytes() == payload
+
+
+def _make_zip(path: Path, members: dict) -> Path:
+    with zipfile.ZipFile(path, "w") as z:
+        for name, data in members.items():
+            z.writestr(name, data)
+    return path
+
+
+def test_extract_zip_sanitises_member_paths(tmp_path):
+    save_dir = tmp_path / "out"
+    zip_path = _make_zip(
+        tmp_path / "dl.zip",
+        {
+            "../evil.txt": b"up",
+            "/abs/x.txt": b"abs",
+            "a/./b.txt": b"dot",
+            "dir/": b"",
+        },
+    )
+
+    produced = extract_zip(zip_path, save_dir)
+
+    assert sorted(produced) == sorted(
+        [save_dir / "evil.txt", save_dir / "abs" / "x.txt", save_dir / "a" / "b.txt"]
+    )
+    assert (save_dir / "evil.txt").read_bytes() == b"up"
+    assert (save_dir / "abs" / "x.txt").read_bytes() == b"abs"
+    assert (save_dir / "a" / "b.txt").read_bytes() == b"dot"
+    assert not (tmp_path / "evil.txt").exists()
+    assert not (save_dir / "dir").exists()  # directory entries are skipped
+    assert not zip_path.exists()
+
+
+def test_extract_zip_gunzips_gz_members_in_stream(tmp_path):
+    save_dir = tmp_path / "out"
+    zip_path = _make_zip(
+        tmp_path / "dl.zip",
+        {"BTCUSDT_2026-01-01.csv.gz": gzip.compress(b"a,b\n1,2\n"), "README": b"hi"},
+    )
+
+    produced = extract_zip(zip_path, save_dir, delete_original=False)
+
+    assert produced == [save_dir / "BTCUSDT_2026-01-01.csv", save_dir / "README"]
+    assert produced[0].read_bytes() == b"a,b\n1,2\n"
+    assert not (save_dir / "BTCUSDT_2026-01-01.csv.gz").exists()
+    assert zip_path.exists()
+
+
+def test_extract_zip_keeps_zip_on_failure(tmp_path):
+    zip_path = _make_zip(
+        tmp_path / "dl.zip",
+        {"good.csv": b"ok", "bad.csv.gz": b"not gzip data"},
+    )
+
+    with pytest.raises(gzip.BadGzipFile):
+        extract_zip(zip_path, tmp_path / "out")
+
+    assert zip_path.exists()
+
+
+def test_extract_zip_extracts_members_in_threads(tmp_path, monkeypatch):
+    members = {f"part{i}.csv": os.urandom(1000 + i) for i in range(8)}
+    zip_path = _make_zip(tmp_path / "dl.zip", members)
+
+    # every copy waits until another one runs concurrently
+    barrier = threading.Barrier(2, timeout=5)
+    copy = _copy_stream
+
+    def _copy_together(f_in, f_out, buffer_size):
+        barrier.wait()
+        copy(f_in, f_out, buffer_size)
+
+    monkeypatch.setattr(sys.modules[__name__], "_copy_stream", _copy_together)
+
+    produced = extract_zip(zip_path, tmp_path / "out", max_workers=2)
+
+    assert produced == [tmp_path / "out" / name for name in members]
+    assert all(p.read_bytes() == members[p.name] for p in produced)
+
+
+def test_unpack_download_dispatches_on_suffix(tmp_path):
+    zip_path = _make_zip(tmp_path / "a.zip", {"a.csv.gz": gzip.compress(b"zipped")})
+    gz_path = tmp_path / "b.csv.gz"
+    gz_path.write_bytes(gzip.compress(b"gzipped"))
+    csv_path = tmp_path / "c.csv"
+    csv_path.write_bytes(b"plain")
+
+    assert unpack_download(zip_path, tmp_path / "out") == [tmp_path / "out" / "a.csv"]
+    assert unpack_download(gz_path, tmp_path / "out") == [tmp_path / "b.csv"]
+    assert unpack_download(csv_path, tmp_path / "out") == [csv_path]
+
+    assert (tmp_path / "out" / "a.csv").read_bytes() == b"zipped"
+    assert (tmp_path / "b.csv").read_bytes() == b"gzipped"
+    assert not zip_path.exists() and not gz_path.exists()
+
+
+@pytest.mark.parametrize(
+    "n, extra",
+    [(1, 0), (5, 0), (5, 1), (5, 4), (7, 3)],  # extra days: partial last chunk
+)
+@pytest.mark.parametrize(
+    "full_chunks", [NUMPY_MIN_CHUNKS - 1, NUMPY_MIN_CHUNKS, NUMPY_MIN_CHUNKS + 1]
+)
+def test_split_date_range_numpy_matches_scalar(n, extra, full_chunks):
+    pytest.importorskip("numpy")
+    start = date(1999, 12, 30)  # crosses leap days and a century boundary
+    end = date.fromordinal(start.toordinal() + full_chunks * n + extra - 1)
+    s, e = start.toordinal(), end.toordinal()
+    scalar = tuple(
+        [(_iso_from_ord(a), _iso_from_ord(b)) for a, b in _chunk_ordinals(s, e, n)]
+    )
+
+    assert len(scalar) == full_chunks + (extra > 0)
+    assert scalar[-1][1] == end.isoformat()
+    assert _split_date_range_numpy(start, end, n) == scalar
+    # only ranges above the threshold take the NumPy path here
+    assert split_date_range(start.isoformat(), end.isoformat(), n) == scalar
+
+
+@pytest.mark.parametrize(
+    "bad",
+    [
+        "20260101",  # accepted by date.fromisoformat since Python 3.11
+        "2026-1-01",
+        "2026-01-1",
+        "２０２６-01-01",  # fullwidth digits
+        "2026-01-0١",  # Arabic-Indic digit
+        "2026-01-01T00:00",
+    ],
+)
+def test_split_date_range_rejects_non_yyyy_mm_dd(bad):
+    with pytest.raises(ValueError, match=r"start_date must be 'YYYY-MM-DD'"):
+        split_date_range(bad, "2026-03-01", 5)
+    with pytest.raises(ValueError, match=r"end_date must be 'YYYY-MM-DD'"):
+        split_date_range("2025-01-01", bad, 5)
+
+
+def test_split_date_range_rejects_invalid_values():
+    with pytest.raises(ValueError, match=r"Invalid date value '2026-02-30'"):
+        split_date_range("2026-02-30", "2026-03-01", 5)
+    with pytest.raises(ValueError, match="n must be a positive integer"):
+        split_date_range("2026-01-01", "2026-01-10", 0)
+    with pytest.raises(ValueError, match="start_date must be <= end_date"):
+        split_date_range("2026-01-10", "2026-01-01", 5)
+
+
+def test_split_date_range_objs_matches_strings():
+    chunks = split_date_range("2024-02-26", "2024-03-06", 3)
+
+    assert chunks == (
+        ("2024-02-26", "2024-02-28"),
+        ("2024-02-29", "2024-03-02"),
+        ("2024-03-03", "2024-03-05"),
+        ("2024-03-06", "2024-03-06"),
+    )
+    assert split_date_range_objs("2024-02-26", "2024-03-06", 3) == tuple(
+        (date.fromisoformat(a), date.fromisoformat(b)) for a, b in chunks
+    )
+    with pytest.raises(ValueError, match="start_date must be 'YYYY-MM-DD'"):
+        split_date_range_objs("20240226", "2024-03-06", 3)